@@ -1,40 +1,60 @@
 import os
 import json
+import mmap
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+try:
+    import orjson  # Much faster JSON serialization for large batches
+except ImportError:
+    orjson = None
+
 # --- CONFIGURATION ---
 INPUT_DIR = "output_fastas"           # Folder containing your FASTA files
 OUTPUT_JSON = "alphafold_jobs.json"  # Output file for batch submission
 
+WHITESPACE = b"\n\r \t"  # Bytes removed from sequence payloads
+
 # --- FUNCTION DEFINITIONS ---
 
 def parse_fasta(fasta_path):
     """Parse a FASTA file and return a list of (header, sequence) tuples."""
     sequences = []
-    header = None
-    seq_lines = []
-
-    with open(fasta_path, 'r') as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            if line.startswith(">"):
-                if header:
-                    sequences.append((header, ''.join(seq_lines)))
-                header = line[1:].strip()
-                seq_lines = []
+
+    with open(fasta_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return sequences
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            # Skip anything before the first header
+            if data[:1] == b">":
+                i = 0
             else:
-                seq_lines.append(line)
-        if header:
-            sequences.append((header, ''.join(seq_lines)))
+                i = data.find(b"\n>")
+                if i < 0:
+                    return sequences
+                i += 1
+
+            # Jump between record boundaries with memchr-backed find() calls
+            # instead of visiting every line in Python
+            n = len(data)
+            while i >= 0:
+                nl = data.find(b"\n", i)
+                if nl < 0:
+                    nl = n
+                header = data[i + 1:nl].strip().decode()
+                nxt = data.find(b"\n>", nl)
+                if header:
+                    # translate() strips every newline/whitespace byte in a single C loop
+                    seq = data[nl + 1:nxt if nxt >= 0 else n].translate(None, WHITESPACE)
+                    sequences.append((header, seq.decode()))
+                i = nxt + 1 if nxt >= 0 else -1
 
     return sequences
 
 
-def fasta_to_job(fasta_path):
-    """Convert one FASTA file into a JSON AlphaFold job entry."""
-    sequences = parse_fasta(fasta_path)
+def build_job(name, sequences):
+    """Build the AlphaFold job entry for a list of (header, sequence) tuples."""
     chains = []
     for header, seq in sequences:
         chains.append({
@@ -45,30 +65,98 @@ def fasta_to_job(fasta_path):
         })
     
     job = {
-        "name": Path(fasta_path).stem,
+        "name": name,
         "sequences": chains,
         "modelSeeds": []
     }
     return job
 
 
+def fasta_to_job(fasta_path):
+    """Convert one FASTA file into a JSON AlphaFold job entry."""
+    return build_job(Path(fasta_path).stem, parse_fasta(fasta_path))
+
+
+def dump_job(job):
+    """Serialize one job as it appears inside the top-level JSON array (2-space indent)."""
+    data = orjson.dumps(job, option=orjson.OPT_INDENT_2) if orjson is not None else b""
+    if not data or not data.isascii():
+        # orjson writes raw UTF-8; keep the stdlib's \uXXXX escapes so the output is the same either way
+        data = json.dumps(job, indent=2).encode()
+    # Nest one level under the array; JSON strings never contain raw newlines
+    return b"  " + data.replace(b"\n", b"\n  ")
+
+
+# Pre-rendered JSON for the fixed job schema, byte-identical to dump_job(build_job(...)) (see test_AF_batch_gen.py)
+JOB_TEMPLATE = b'  {\n    "name": "%s",\n    "sequences": [%s],\n    "modelSeeds": []\n  }'
+CHAIN_TEMPLATE = b'      {\n        "proteinChain": {\n          "sequence": "%s",\n          "count": 1\n        }\n      }'
+
+
+def is_json_safe(text):
+    """True if `text` can be placed between JSON quotes without escaping."""
+    return text.isascii() and text.isprintable() and '"' not in text and "\\" not in text
+
+
+def render_job(name, sequences):
+    """Serialize a job like dump_job(build_job(...)), using the templates when no escaping is needed."""
+    if not (is_json_safe(name) and all(is_json_safe(seq) for _, seq in sequences)):
+        # Anything needing escapes goes through the real JSON encoder
+        return dump_job(build_job(name, sequences))
+
+    chains = b",\n".join(CHAIN_TEMPLATE % seq.encode() for _, seq in sequences)
+    if chains:
+        chains = b"\n" + chains + b"\n    "
+    return JOB_TEMPLATE % (name.encode(), chains)
+
+
+def fasta_to_job_bytes(fasta_path):
+    """
+    Convert one FASTA file straight to its serialized job entry, returning
+    (job_bytes, number_of_chains). Skips building the job dict for plain names/sequences.
+    """
+    sequences = parse_fasta(fasta_path)
+    return render_job(Path(fasta_path).stem, sequences), len(sequences)
+
+
+def iter_jobs(fasta_files, max_workers):
+    """Yield serialized jobs in order while parsing ahead in a thread pool with a bounded window."""
+    with ThreadPoolExecutor(max_workers=max_workers) as ex:
+        pending = deque()
+        for fasta in fasta_files:
+            pending.append(ex.submit(fasta_to_job_bytes, fasta))
+            if len(pending) >= 2 * max_workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
 def main():
     fasta_files = sorted(Path(INPUT_DIR).glob("*.fasta"))
-    jobs = []
 
     if not fasta_files:
         print(f"No FASTA files found in {INPUT_DIR}")
         return
 
-    for fasta in fasta_files:
-        job = fasta_to_job(fasta)
-        jobs.append(job)
-        print(f"Added job for {fasta.name} ({len(job['sequences'])} sequences)")
-
-    with open(OUTPUT_JSON, "w") as out:
-        json.dump(jobs, out, indent=2)
+    # Parsing is I/O-bound, so read the files concurrently. Jobs are streamed
+    # to a temp file so only a small window of them is held in memory; it only
+    # replaces OUTPUT_JSON once complete, so a failed run keeps the old output.
+    tmp_path = f"{OUTPUT_JSON}.tmp"
+    try:
+        with open(tmp_path, "wb") as out:
+            out.write(b"[\n")
+            jobs = iter_jobs(fasta_files, max_workers=min(32, len(fasta_files)))
+            for n, (fasta, (job_bytes, n_chains)) in enumerate(zip(fasta_files, jobs)):
+                if n:
+                    out.write(b",\n")
+                out.write(job_bytes)
+                print(f"Added job for {fasta.name} ({n_chains} sequences)")
+            out.write(b"\n]")
+        os.replace(tmp_path, OUTPUT_JSON)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
 
-    print(f"\nDone. Wrote {len(jobs)} jobs to {OUTPUT_JSON}")
+    print(f"\nDone. Wrote {len(fasta_files)} jobs to {OUTPUT_JSON}")
 
 
 if __name__ == "__main__":
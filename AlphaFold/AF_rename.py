@@ -8,39 +8,51 @@ target_directory = './AlphaFold'
 # Group 1: ligand (e.g., timp3)
 # Group 2: variant (e.g., agestc)
 # Group 3: target (e.g., mmp2)
+# Only used as a fallback for names the fast path below does not accept (e.g. upper-case "FOLD_")
 pattern = re.compile(r"^fold_([a-zA-Z0-9]+)_variant_([a-zA-Z0-9]+)_([a-zA-Z0-9]+)\.zip$", re.IGNORECASE)
 
+
+def parse_fold_name(filename):
+    """Return (ligand, variant, target) for a fold_*_variant_*_*.zip name, or None."""
+    # Fast path: the name is fixed and literal-delimited, so plain slicing/splitting avoids the regex engine
+    if filename.startswith("fold_") and filename.endswith(".zip"):
+        parts = filename[5:-4].split("_", 3)
+        if len(parts) == 4 and parts[1] == "variant":
+            ligand, _, variant, target = parts
+            if all(p.isascii() and p.isalnum() for p in (ligand, variant, target)):
+                return ligand, variant, target
+
+    match = pattern.match(filename)
+    if match:
+        return match.group(1), match.group(2), match.group(3)
+    return None
+
+
 print(f"Starting file renaming in: {os.path.abspath(target_directory)}\n")
 
 renamed_count = 0
-for filename in os.listdir(target_directory):
-    if filename.endswith(".zip"):
-        match = pattern.match(filename)
+# scandir yields DirEntry objects with cached names, avoiding a full listdir + path join per file
+with os.scandir(target_directory) as entries:
+    for entry in entries:
+        filename = entry.name
+        if not filename.endswith(".zip"):
+            continue
+
+        parsed = parse_fold_name(filename)
         
-        if match:
-            # Extract the captured groups
-            ligand = match.group(1)
-            variant = match.group(2)
-            target = match.group(3)
+        if parsed:
+            ligand, variant, target = parsed
             
             # Construct the new filename: {ligand}_variant_{target}_{variant}.zip
             new_filename = f"{ligand}_variant_{target}_{variant}.zip"
             
-            # Full paths for renaming
-            old_path = os.path.join(target_directory, filename)
-            new_path = os.path.join(target_directory, new_filename)
-            
             # Check if the new filename is different from the old one
-            if old_path != new_path:
+            if new_filename != filename:
                 try:
-                    os.rename(old_path, new_path)
+                    os.rename(entry.path, os.path.join(target_directory, new_filename))
                     print(f"Renamed: {filename} -> {new_filename}")
                     renamed_count += 1
                 except OSError as e:
                     print(f"Error renaming {filename}: {e}")
-            else:
-                # This should rarely happen but handles cases where old_path == new_path
-                # based on the pattern match logic.
-                pass 
 
 print(f"\nCompleted. Total files renamed: {renamed_count}")
\ No newline at end of file
@@ -0,0 +1,33 @@
+import json
+
+import pytest
+
+from AF_batch_gen import build_job, dump_job, parse_fasta, render_job
+
+
+@pytest.mark.parametrize("name, sequences", [
+    ("TIMP3_v_MMP9_C_WT", [("TIMP3", "ACDEFG"), ("MMP9", "KLMNPQ")]),
+    ("single", [("A", "ACDEFG")]),
+    ("empty", []),
+    # These need escaping, so render_job has to fall back to the JSON encoder
+    ("café", [("A", "ACDEFG")]),
+    ('quote"name', [("A", "AC\\DE")]),
+])
+def test_render_job_matches_build_job(name, sequences):
+    """The pre-rendered templates must stay byte-identical to the dict-based path."""
+    rendered = render_job(name, sequences)
+    assert rendered == dump_job(build_job(name, sequences))
+    assert json.loads(rendered) == build_job(name, sequences)
+
+
+def test_dump_job_matches_stdlib_indent():
+    """Jobs nest one level inside the top-level array, as json.dump(jobs, indent=2) writes them."""
+    job = build_job("café", [("A", "ACDEFG")])
+    expected = json.dumps([job], indent=2).encode()
+    assert b"[\n" + dump_job(job) + b"\n]" == expected
+
+
+def test_parse_fasta(tmp_path):
+    fasta = tmp_path / "pair.fasta"
+    fasta.write_text("junk\n>A first\nACDE\nFG\r\n\n>B\nKLM\n")
+    assert parse_fasta(fasta) == [("A first", "ACDEFG"), ("B", "KLM")]
@@ -1,6 +1,10 @@
 import requests
 import sys
 import os
+import argparse
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 
 # --- Configuration ---
 # UniProt IDs for the human proteins
@@ -28,13 +32,19 @@ VARIANT_SEQUENCES = [
     "ASESLC" # Wild type
 ]
 
+# UniProt sequences don't change between runs, so they are cached here ({uniprot_id: sequence})
+CACHE_FILE = "uniprot_cache.pkl"
+
+# Shared HTTP session so every UniProt request reuses the same keep-alive connection
+SESSION = requests.Session()
+
 # --- Helper Functions ---
 
-def fetch_sequence(uniprot_id: str) -> str:
+def fetch_sequence(uniprot_id: str, session: requests.Session = SESSION) -> str:
     """Fetches the protein sequence for a given UniProt ID."""
     url = f"https://rest.uniprot.org/uniprotkb/{uniprot_id}.fasta"
     try:
-        response = requests.get(url, timeout=10)
+        response = session.get(url, timeout=10)
         response.raise_for_status() # Raise an exception for bad status codes (4xx or 5xx)
 
         # Sequences are returned in FASTA format, which includes a header line starting with '>'
@@ -58,33 +68,56 @@ def write_fasta_file(filename: str, sequences: dict):
     try:
         dir = list(sequences.keys())[1].split("_")[0]
         os.makedirs(dir, exist_ok=True)
-        with open(dir + "/" + filename, 'w') as f:
-            for header, seq in sequences.items():
-                # Write header line
-                f.write(f">{header}\n")
-                # Write sequence (can be wrapped, but simple AlphaFold usage often takes unwrapped)
-                f.write(f"{seq}\n")
-        with open(dir + "/" + f"complex_{filename}", 'w') as f:
-            f.write(f">{'+'.join(sequences.keys())}\n")
-            # Write sequence (can be wrapped, but simple AlphaFold usage often takes unwrapped)
-            f.write(f"{':'.join(sequences.values())}\n")
+        # Build each file in memory so it is written with a single call
+        # (sequences are left unwrapped, which simple AlphaFold usage expects)
+        body = "".join(f">{header}\n{seq}\n" for header, seq in sequences.items())
+        Path(dir, filename).write_bytes(body.encode())
+        complex_body = f">{'+'.join(sequences.keys())}\n{':'.join(sequences.values())}\n"
+        Path(dir, f"complex_{filename}").write_bytes(complex_body.encode())
         print(f"Successfully created file: {filename}")
     except IOError as e:
         print(f"Error writing file {filename}: {e}", file=sys.stderr)
 
 # --- Main Logic ---
 
-def generate_fasta_files():
+def load_cached_sequences(cache_path: Path) -> dict:
+    """Returns the cached {uniprot_id: sequence} dict, or {} if it is missing or unreadable."""
+    if not cache_path.exists():
+        return {}
+    try:
+        cached = pickle.loads(cache_path.read_bytes())
+    except Exception as e: # Unpickling a corrupt file can raise nearly anything
+        print(f"Warning: Ignoring unreadable cache {cache_path}: {e}", file=sys.stderr)
+        return {}
+    if not isinstance(cached, dict):
+        print(f"Warning: Ignoring malformed cache {cache_path}", file=sys.stderr)
+        return {}
+    # Drop any entries that aren't {str: str}; they are simply re-fetched
+    return {uid: seq for uid, seq in cached.items() if isinstance(uid, str) and isinstance(seq, str)}
+
+def generate_fasta_files(refresh: bool = False):
     """Fetches sequences, creates the variants, and generates all required FASTA files."""
     
-    # Fetch all required sequences (only once)
-    print("Fetching protein sequences from UniProt...")
-    full_sequences = {}
-    for name, uid in UNIPROT_IDS.items():
-        full_sequences[name] = fetch_sequence(uid)
-        if not full_sequences[name]:
+    # Fetch all required sequences (only once, then reuse the on-disk cache)
+    cache_path = Path(CACHE_FILE)
+    cached = {} if refresh else load_cached_sequences(cache_path)
+    missing = [uid for uid in UNIPROT_IDS.values() if not cached.get(uid)]
+    if not missing:
+        print(f"Using cached protein sequences from {cache_path}")
+    else:
+        print(f"Fetching {len(missing)} protein sequence(s) from UniProt...")
+        # Requests are network-bound, so fetch them in parallel
+        with ThreadPoolExecutor(max_workers=len(missing)) as ex:
+            fetched = dict(zip(missing, ex.map(fetch_sequence, missing)))
+        if not all(fetched.values()):
             print("Aborting file generation due to sequence fetch failure.", file=sys.stderr)
             return
+        cached.update(fetched)
+        try:
+            cache_path.write_bytes(pickle.dumps(cached))
+        except OSError as e:
+            print(f"Warning: Could not write cache {cache_path}: {e}", file=sys.stderr)
+    full_sequences = {name: cached[uid] for name, uid in UNIPROT_IDS.items()}
 
     # Check for TIMP3 full sequence length for validation (P35625 is 211 residues)
     timp3_full_seq = full_sequences["TIMP3"]
@@ -99,48 +132,50 @@ def generate_fasta_files():
     print(f"Wild-type 6-residue segment being replaced: {segment_to_replace}")
     print(f"Total number of variant sequences to process: {len(VARIANT_SEQUENCES)}\n")
     
+    # The scaffold around the replaced segment and the target records are the same for
+    # every variant, so build them once
+    timp3_prefix = TIMP3_MATURE_WT[:REPLACEMENT_START_INDEX]
+    timp3_suffix = TIMP3_MATURE_WT[REPLACEMENT_START_INDEX + REPLACEMENT_LENGTH:]
+    targets = [
+        (name, f"{name}_HUMAN|{uid}", full_sequences[name])
+        for name, uid in UNIPROT_IDS.items() if name != "TIMP3"
+    ]
+
     # Iterate through all variants and generate files
     print("Generating FASTA files for AlphaFold-Multimer:")
     for i, variant_sequence in enumerate(VARIANT_SEQUENCES):
         print(f"--- Processing Variant {i+1}/{len(VARIANT_SEQUENCES)}: {variant_sequence} ---")
         
         # Construct the Variant TIMP3 Sequence
-        TIMP3_VARIANT_SEQ = (
-            TIMP3_MATURE_WT[:REPLACEMENT_START_INDEX] + 
-            variant_sequence + 
-            TIMP3_MATURE_WT[REPLACEMENT_START_INDEX + REPLACEMENT_LENGTH:]
-        )
+        TIMP3_VARIANT_SEQ = timp3_prefix + variant_sequence + timp3_suffix
         
-        if variant_sequence == "ASESLC": # WT sequence
-            timp3_variant_header = f"TIMP3_VARIANT_WT_HUMAN|P35625"
-        else: 
-            timp3_variant_header = f"TIMP3_VARIANT_{variant_sequence}_HUMAN|P35625"
+        # Using the variant sequence in the header/filename for easy identification
+        variant_label = "WT" if variant_sequence == "ASESLC" else variant_sequence # WT sequence
+        timp3_variant_header = f"TIMP3_VARIANT_{variant_label}_HUMAN|P35625"
 
         # Define sequences for the two AlphaFold runs
-        for name, uid in UNIPROT_IDS.items():
-            if name == "TIMP3":
-                continue
-            target_header = f"{name}_HUMAN|{uid}"
+        for name, target_header, target_sequence in targets:
             # Run 1: TIMP3 Variant and target
             fasta_target = {
                 timp3_variant_header: TIMP3_VARIANT_SEQ,
-                target_header: full_sequences[name]
+                target_header: target_sequence
             }
 
             # Write the files
-            # Using the variant sequence in the filename for easy identification
-            if variant_sequence == "ASESLC":
-                variant_sequence = "WT"
-            write_fasta_file(f"TIMP3_v_{name}_C_{variant_sequence}.fasta", fasta_target)
+            write_fasta_file(f"TIMP3_v_{name}_C_{variant_label}.fasta", fasta_target)
         
     print(f"\nBatch generation complete. {len(VARIANT_SEQUENCES) * (len(UNIPROT_IDS) - 1)} FASTA files\
            ({len(VARIANT_SEQUENCES)} variants * {len(UNIPROT_IDS) - 1} targets) are ready for AlphaFold-Multimer.")
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate TIMP3 variant FASTA files for AlphaFold-Multimer.")
+    parser.add_argument('--refresh', action='store_true', help=f'Ignore {CACHE_FILE} and re-fetch sequences from UniProt.')
+    args = parser.parse_args()
+
     # Ensure requests library is available (though typically it is in these environments)
     try:
         import requests
-        generate_fasta_files()
+        generate_fasta_files(refresh=args.refresh)
     except ImportError:
         print("Error: The 'requests' library is required. Please ensure it is installed.", file=sys.stderr)
@@ -1,12 +1,15 @@
 import os
-import glob
+import mmap
 import argparse
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
 from collections import OrderedDict
 import sys
 
 # --- Configuration ---
 OUTPUT_DIR = 'output_fastas'
+WHITESPACE = b'\n\r \t'  # Bytes removed from sequence payloads
 # ---------------------
 
 def parse_fasta(file_path):
@@ -15,66 +18,87 @@ def parse_fasta(file_path):
     Sequence lines are joined into a single string.
     """
     sequences = OrderedDict()
-    current_header = None
-    current_sequence_lines = []
-
-    with open(file_path, 'r') as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            
-            if line.startswith('>'):
-                if current_header:
-                    sequences[current_header] = "".join(current_sequence_lines)
-                
-                current_header = line
-                current_sequence_lines = []
+
+    with open(file_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return sequences
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            # Skip anything before the first header
+            if data[:1] == b'>':
+                i = 0
             else:
-                current_sequence_lines.append(line)
-        
-        # Add the last record
-        if current_header:
-            sequences[current_header] = "".join(current_sequence_lines)
-            
+                i = data.find(b'\n>')
+                if i < 0:
+                    return sequences
+                i += 1
+
+            # Locate record boundaries with memchr-backed find() calls on the mapped file
+            n = len(data)
+            while i >= 0:
+                nl = data.find(b'\n', i)
+                if nl < 0:
+                    nl = n
+                current_header = data[i:nl].rstrip().decode()
+                nxt = data.find(b'\n>', nl)
+                # translate() drops all line breaks/whitespace from the payload in one C loop
+                seq = data[nl + 1:nxt if nxt >= 0 else n].translate(None, WHITESPACE)
+                sequences[current_header] = seq.decode()
+                i = nxt + 1 if nxt >= 0 else -1
+
     return sequences
 
-def write_fasta(file_path, sequences):
+def wrap_sequence(seq, width=60):
+    """
+    Returns the sequence encoded as bytes and wrapped to `width` characters,
+    with a trailing newline after each line.
+    """
+    data = seq.encode()
+    if not data:
+        return b""
+    return b"\n".join(data[i:i+width] for i in range(0, len(data), width)) + b"\n"
+
+def write_fasta(file_path, sequences, prewrapped=None):
     """
     Writes sequences from an OrderedDict to a FASTA file.
     Sequences are wrapped to 60 characters for standard FASTA format.
+    `prewrapped` optionally maps headers to already-wrapped sequence bytes.
     """
-    with open(file_path, 'w') as f:
-        for header, seq in sequences.items():
-            f.write(f"{header}\n")
-            # Wrap the sequence at 60 characters
-            for i in range(0, len(seq), 60):
-                f.write(f"{seq[i:i+60]}\n")
-
-def process_fasta_file(input_file_path, output_dir, replacement_seq):
+    prewrapped = prewrapped or {}
+    # Build the whole file in memory and hand it to a single write() call
+    buf = bytearray()
+    for header, seq in sequences.items():
+        buf += f"{header}\n".encode()
+        wrapped = prewrapped.get(header)
+        buf += wrapped if wrapped is not None else wrap_sequence(seq)
+    with open(file_path, 'wb') as f:
+        f.write(buf)
+
+def process_fasta_file(input_file_path, output_dir, replacement_seq, replacement_wrapped=None):
     """
     Reads a FASTA file, processes the second sequence based on filename,
     and writes the modified file to the output directory.
+    `replacement_wrapped` is wrap_sequence(replacement_seq), if already computed.
+    Returns (written, messages) so the caller can report results in order.
     """
     filename = Path(input_file_path).name
-    print(f"Processing: {filename}")
+    messages = [f"Processing: {filename}"]
 
     # 1. Parse the FASTA file
     try:
         sequences = parse_fasta(input_file_path)
     except Exception as e:
-        print(f"Error parsing {filename}: {e}")
-        return
+        messages.append(f"Error parsing {filename}: {e}")
+        return False, messages
 
-    headers = list(sequences.keys())
-    
     # Check for at least two sequences
-    if len(headers) < 2:
-        print(f"  Skipping: {filename} has less than two sequences.")
-        return
-
-    # 2. Get the header for the second sequence
-    second_header = headers[1]
+    if len(sequences) < 2:
+        messages.append(f"  Skipping: {filename} has less than two sequences.")
+        return False, messages
+
+    # 2. Get the header for the second sequence (without materializing the key list)
+    headers = iter(sequences)
+    next(headers)
+    second_header = next(headers)
     
     # 3. Determine the new sequence based on the filename rule
     if filename.startswith("complex_"):
@@ -89,7 +113,7 @@ def process_fasta_file(input_file_path, output_dir, replacement_seq):
             protein_id, rest_of_header = description.split(':', 1)
         except ValueError:
             # Handle cases where the 'complex_' file doesn't use the expected ':' separator in the second header
-            print(f"  Warning: 'complex_' file {filename} does not have a ':' in the second header. Replacing the whole second sequence.")
+            messages.append(f"  Warning: 'complex_' file {filename} does not have a ':' in the second header. Replacing the whole second sequence.")
             sequences[second_header] = replacement_seq
         else:
             # Reconstruct the new header and sequence
@@ -97,18 +121,21 @@ def process_fasta_file(input_file_path, output_dir, replacement_seq):
             
             # New sequence to replace the existing one
             sequences[second_header] = replacement_seq
-            print(f"  Result: Replaced second sequence with predefined sequence. Header remains: {second_header}")
+            messages.append(f"  Result: Replaced second sequence with predefined sequence. Header remains: {second_header}")
 
     else:
         # Normal FASTA file (not starting with 'complex_')
         # Simply replace the sequence of the second record.
         sequences[second_header] = replacement_seq
-        print(f"  Result: Replaced second sequence with predefined sequence. Header remains: {second_header}")
+        messages.append(f"  Result: Replaced second sequence with predefined sequence. Header remains: {second_header}")
 
     # 4. Write the modified content to the output directory
     output_file_path = Path(output_dir) / filename
-    write_fasta(output_file_path, sequences)
-    print(f"  Wrote modified file to: {output_file_path}")
+    if replacement_wrapped is None:
+        replacement_wrapped = wrap_sequence(replacement_seq)
+    write_fasta(output_file_path, sequences, prewrapped={second_header: replacement_wrapped})
+    messages.append(f"  Wrote modified file to: {output_file_path}")
+    return True, messages
 
 # --- Main Execution ---
 def main(input_dir, replacement_sequence):
@@ -121,16 +148,31 @@ def main(input_dir, replacement_sequence):
     Path(OUTPUT_DIR).mkdir(exist_ok=True)
 
     # Get all FASTA files in the input directory
-    # Using 'iglob' to find all files ending with '.fasta' or '.fa' (case-insensitive)
-    fasta_files = list(glob.iglob(os.path.join(input_dir, '*.[fF][aA][sS][tT][aA]')))
-    fasta_files.extend(list(glob.iglob(os.path.join(input_dir, '*.[fF][aA]'))))
+    # A single scandir pass finds all files ending with '.fasta' or '.fa' (case-insensitive)
+    with os.scandir(input_dir) as entries:
+        fasta_files = [
+            entry.path for entry in entries
+            if entry.is_file() and not entry.name.startswith('.')
+            and entry.name.lower().endswith(('.fasta', '.fa'))
+        ]
 
     if not fasta_files:
         print(f"No FASTA files found in {input_dir}. Please check the path and file extensions.")
         return
 
-    for file_path in fasta_files:
-        process_fasta_file(file_path, OUTPUT_DIR, replacement_sequence)
+    # Files are independent, so process them in parallel. Workers return their
+    # messages instead of printing, which keeps the output in input order.
+    # The replacement goes into every output file, so wrap/encode it only once
+    worker = partial(process_fasta_file, output_dir=OUTPUT_DIR, replacement_seq=replacement_sequence,
+                     replacement_wrapped=wrap_sequence(replacement_sequence))
+    with ProcessPoolExecutor() as ex:
+        results = list(ex.map(worker, fasta_files))
+
+    for _, messages in results:
+        print("\n".join(messages))
+
+    written = sum(1 for ok, _ in results if ok)
+    print(f"Modified {written} of {len(fasta_files)} FASTA files.")
 
     print("--- Processing Complete ---")
 
@@ -1,5 +1,51 @@
 import os
 import argparse
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+def separate_fasta_file(input_file_path, output_folder):
+    """
+    Splits the colon-separated sequence of one FASTA file into two records
+    and writes them to the output folder. Returns a status message.
+    """
+    filename = input_file_path.name
+    try:
+        # Only the header and the combined sequence line are needed, so don't read the rest
+        with open(input_file_path, 'rb') as f_in:
+            header_line = f_in.readline()
+
+            # Basic validation for FASTA format
+            if header_line[:1] != b'>':
+                return f"Warning: Skipping '{filename}' as it doesn't appear to be a FASTA file."
+
+            sequence_line = f_in.readline()
+
+        if not sequence_line:
+            return f"Error processing file {filename}: missing sequence line"
+
+        # Get the header and the combined sequence line
+        header = header_line.strip().lstrip(b'>')
+        combined_sequence = sequence_line.strip()
+
+        # Split the sequence by the colon
+        colon = combined_sequence.find(b':')
+        if colon < 0 or combined_sequence.find(b':', colon + 1) >= 0:
+            return f"Warning: Could not find two colon-separated sequences in '{filename}'. Skipping."
+
+        seq1 = combined_sequence[:colon]
+        seq2 = combined_sequence[colon + 1:]
+        
+        # Create a new filename for the output
+        output_filename = f"{os.path.splitext(filename)[0]}_separated.fasta"
+        output_file_path = Path(output_folder) / output_filename
+
+        # Write the two new sequences to the output file in a single call
+        output_file_path.write_bytes(b">%s_seq1\n%s\n>%s_seq2\n%s\n" % (header, seq1, header, seq2))
+
+        return f"Successfully processed '{filename}' -> '{output_filename}'"
+
+    except Exception as e:
+        return f"Error processing file {filename}: {e}"
 
 def process_fasta_files(input_folder, output_folder):
     """
@@ -11,52 +57,14 @@ def process_fasta_files(input_folder, output_folder):
         os.makedirs(output_folder)
         print(f"Created output directory: {output_folder}")
 
-    # Loop through all files in the input folder
-    for filename in os.listdir(input_folder):
-        # Construct the full file path
-        input_file_path = os.path.join(input_folder, filename)
-
-        # Process only files, not subdirectories
-        if os.path.isfile(input_file_path):
-            try:
-                with open(input_file_path, 'r') as f_in:
-                    lines = f_in.readlines()
-
-                # Basic validation for FASTA format
-                if not lines or not lines[0].startswith('>'):
-                    print(f"Warning: Skipping '{filename}' as it doesn't appear to be a FASTA file.")
-                    continue
-                
-                # Get the header and the combined sequence line
-                header = lines[0].strip().lstrip('>')
-                combined_sequence = lines[1].strip()
-
-                # Split the sequence by the colon
-                sequences = combined_sequence.split(':')
-
-                if len(sequences) != 2:
-                    print(f"Warning: Could not find two colon-separated sequences in '{filename}'. Skipping.")
-                    continue
-
-                # Prepare the new content for the output file
-                seq1 = sequences[0]
-                seq2 = sequences[1]
-                
-                # Create a new filename for the output
-                output_filename = f"{os.path.splitext(filename)[0]}_separated.fasta"
-                output_file_path = os.path.join(output_folder, output_filename)
-
-                # Write the two new sequences to the output file
-                with open(output_file_path, 'w') as f_out:
-                    f_out.write(f">{header}_seq1\n")
-                    f_out.write(f"{seq1}\n")
-                    f_out.write(f">{header}_seq2\n")
-                    f_out.write(f"{seq2}\n")
-                
-                print(f"Successfully processed '{filename}' -> '{output_filename}'")
+    # Process only files, not subdirectories
+    with os.scandir(input_folder) as entries:
+        input_files = [Path(entry.path) for entry in entries if entry.is_file()]
 
-            except Exception as e:
-                print(f"Error processing file {filename}: {e}")
+    # Files are independent and the work is I/O-bound, so overlap it across threads
+    with ThreadPoolExecutor() as ex:
+        for message in ex.map(separate_fasta_file, input_files, [output_folder] * len(input_files)):
+            print(message)
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(